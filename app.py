@@ -3,28 +3,149 @@
 Web interface for PN532 NFC reader — direct serial communication.
 """
 
+import functools
 import logging
 import os
 import signal
 import threading
 import time
-from collections import deque
 
 import ndef
-from flask import Flask, render_template, jsonify, request
-from pn532 import PN532, Type4TagEmulator, VaultTagEmulator
+import orjson
+from flask import Flask, Response, render_template, jsonify, request
+from flask.json.provider import JSONProvider
+from waitress import serve
+from pn532 import PN532, LogEntry, Type4TagEmulator, VaultTagEmulator
+
+
+def _json_default(obj):
+    if isinstance(obj, LogEntry):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    The log endpoints serialize hundreds of small entries per response;
+    orjson does that several times faster than the stdlib encoder.
+    LogEntry objects are serialized as {time, direction, data}.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_json_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # orjson already produces UTF-8 bytes; skip the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=_json_default),
+                                        mimetype='application/json')
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 logger = logging.getLogger(__name__)
 
+
+class LogBuffer:
+    """Bounded, sequence-numbered store for emulation log entries.
+
+    Every appended entry gets the next sequence number, so pollers can
+    ask for just the entries after the last ``total`` they saw instead of
+    copying the whole buffer on each request. Only the newest ``maxlen``
+    entries are kept.
+
+    A poller that falls more than ``maxlen`` entries behind loses the
+    oldest ones; since() reports how many, so the UI can say so. Entries
+    removed by clear() are not counted as dropped, and neither are
+    entries trimmed before a reader's first call (``seq`` 0), since that
+    reader never had a cursor into them.
+
+    Writers serialize on a lock; since() does not take it. The
+    (start sequence, entry list, clear mark) state is published as one
+    tuple and replaced wholesale on trim/clear, so a reader always sees
+    a consistent snapshot while list.append and slicing stay atomic
+    under the GIL. Only wait() takes the lock, to block on the
+    condition writers notify.
+    """
+
+    def __init__(self, maxlen=500):
+        self._maxlen = maxlen
+        # (sequence number of entries[0], entries, sequence number at last clear)
+        self._state = (0, [], 0)
+        self._lock = threading.Lock()
+        self._appended = threading.Condition(self._lock)
+
+    def append(self, entry):
+        with self._lock:
+            start, entries, cleared = self._state
+            entries.append(entry)
+            # Trim in batches so compaction stays amortized O(1) per append
+            if len(entries) >= 2 * self._maxlen:
+                drop = len(entries) - self._maxlen
+                self._state = (start + drop, entries[drop:], cleared)
+            self._appended.notify_all()
+
+    def extend(self, new_entries):
+        """Append several entries under a single lock acquisition."""
+        with self._lock:
+            start, entries, cleared = self._state
+            entries.extend(new_entries)
+            if len(entries) >= 2 * self._maxlen:
+                drop = len(entries) - self._maxlen
+                self._state = (start + drop, entries[drop:], cleared)
+            self._appended.notify_all()
+
+    def clear(self):
+        with self._lock:
+            start, entries, _ = self._state
+            end = start + len(entries)
+            self._state = (end, [], end)
+
+    def since(self, seq=0):
+        """Return entries appended at or after ``seq``.
+
+        Returns (entries, next sequence number, number of entries lost
+        because they were trimmed before this call). With ``seq`` 0 (no
+        cursor yet) nothing is reported as lost.
+        """
+        start, entries, cleared = self._state
+        n = len(entries)
+        first = min(max(seq - start, n - self._maxlen, 0), n)
+        new = entries[first:]
+        dropped = max(start + first - max(seq, cleared), 0) if seq else 0
+        # Count from the slice so the total matches what was returned even
+        # if the writer appended in between.
+        return new, start + first + len(new), dropped
+
+    def wait(self, seq, timeout=None):
+        """Block until an entry numbered ``seq`` or later exists.
+
+        Returns False if ``timeout`` expires first.
+        """
+        def ready():
+            start, entries, _ = self._state
+            return start + len(entries) > seq
+
+        with self._lock:
+            return self._appended.wait_for(ready, timeout)
+
+
 # PN532 direct serial reader
 pn532_reader = PN532()
 
 # Emulation state
 emulation_thread = None
 emulation_stop_event = None
-log_buffer = deque(maxlen=500)
-log_lock = threading.Lock()
+log_buffer = LogBuffer(maxlen=500)
+
+# waitress worker threads. Every open /api/logs/stream connection pins
+# one for its lifetime (plus up to one 15 s keep-alive after the client
+# goes away), so leave room for several browser tabs next to the API.
+SERVER_THREADS = 16
 
 # Device watchdog: auto-shutdown when PN532 USB device is absent too long
 DEVICE_ABSENT_TIMEOUT = 30  # seconds without device before auto-shutdown
@@ -59,8 +180,12 @@ def _device_watchdog():
                 return
 
 
+@functools.lru_cache(maxsize=64)
 def build_ndef_bytes(ndef_type: str, content: str) -> bytes:
-    """Encode an NDEF message and return raw bytes."""
+    """Encode an NDEF message and return raw bytes.
+
+    Cached, since restarting emulation usually repeats the same content.
+    """
     if ndef_type == 'url':
         record = ndef.UriRecord(content)
     elif ndef_type == 'text':
@@ -108,8 +233,9 @@ def set_port():
 
 @app.route('/api/scan')
 def scan():
-    """Scan for NFC cards."""
-    result = pn532_reader.scan_type_a()
+    """Scan for NFC cards. Pass ?raw=1 to include the plain-text summary."""
+    include_raw = request.args.get('raw', 0, type=int)
+    result = pn532_reader.scan_type_a(include_raw=bool(include_raw))
     return jsonify(result)
 
 
@@ -213,8 +339,7 @@ def emulate_start():
             })
 
         # Clear log buffer
-        with log_lock:
-            log_buffer.clear()
+        log_buffer.clear()
 
         emulation_stop_event = threading.Event()
 
@@ -270,31 +395,56 @@ def emulate_status():
 
 @app.route('/api/logs')
 def get_logs():
-    """Get communication logs."""
-    global log_buffer
+    """Get communication logs.
 
-    since_index = request.args.get('since', 0, type=int)
-
-    with log_lock:
-        logs = list(log_buffer)
-
-    # Return logs after the specified index
-    if since_index > 0 and since_index < len(logs):
-        logs = logs[since_index:]
+    Pass ?since=<total from a previous response> to fetch only the
+    entries appended after that call. ``dropped`` counts entries that
+    were discarded before they could be returned.
+    """
+    since = request.args.get('since', 0, type=int)
+    logs, total, dropped = log_buffer.since(since)
 
     return jsonify({
         'logs': logs,
-        'total': len(log_buffer)
+        'total': total,
+        'dropped': dropped,
     })
 
 
+@app.route('/api/logs/stream')
+def stream_logs():
+    """Push communication logs as Server-Sent Events.
+
+    Each event carries the batch of entries appended since the previous
+    one. The event id is the next sequence number, so a reconnecting
+    EventSource resumes from where it left off via Last-Event-ID.
+
+    Each open stream holds one waitress worker thread. After a client
+    disconnects, the thread is only freed at the next write, which is at
+    most the 15 s keep-alive later, so the server's thread pool is sized
+    with headroom for a few open tabs (see SERVER_THREADS).
+    """
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', 0, type=int)
+
+    def generate(seq):
+        while True:
+            logs, seq, dropped = log_buffer.since(seq)
+            if logs:
+                payload = {'logs': logs, 'total': seq, 'dropped': dropped}
+                yield f"id: {seq}\ndata: {app.json.dumps(payload)}\n\n"
+            elif not log_buffer.wait(seq, timeout=15):
+                yield ": keep-alive\n\n"
+
+    return Response(generate(since), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+
 @app.route('/api/logs/clear', methods=['POST'])
 def clear_logs():
     """Clear communication logs."""
-    global log_buffer
-
-    with log_lock:
-        log_buffer.clear()
+    log_buffer.clear()
 
     return jsonify({'success': True})
 
@@ -307,4 +457,6 @@ if __name__ == '__main__':
     watchdog = threading.Thread(target=_device_watchdog, daemon=True)
     watchdog.start()
 
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    # Single process (emulation state and log_buffer are module globals),
+    # with a thread pool so log polling is not queued behind a slow scan.
+    serve(app, host='0.0.0.0', port=5001, threads=SERVER_THREADS)
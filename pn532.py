@@ -3,12 +3,14 @@ PN532 direct serial communication for ISO 14443A card scanning and
 Type 4 Tag emulation.
 """
 
+import glob
+import os
 import struct
 import threading
 import time
 from dataclasses import dataclass, field
-from datetime import datetime
 
+import ndef
 import serial
 
 
@@ -21,13 +23,119 @@ TFI_HOST_TO_PN532 = 0xD4
 TFI_PN532_TO_HOST = 0xD5
 
 ACK_FRAME = bytes([0x00, 0x00, 0xFF, 0x00, 0xFF, 0x00])
+FRAME_START = bytes([PREAMBLE, START1, START2])
+ACK_AND_HEADER_LEN = len(ACK_FRAME) + 5  # ACK + PREAMBLE START(2) LEN LCS
+MAX_FRAME_LEN = 262  # normal information frame with LEN = 255
+MAX_RESYNC = 64  # bytes of line noise skipped while looking for FRAME_START
+
+# Minimum time between receiving one APDU response and sending the next,
+# so an emulated card (PN532 target) can loop back from TgSetData to TgGetData
+APDU_GAP = 0.02
+
+# Pause between complete tag operations (e.g. in the vault test scripts).
+# Each operation re-runs wakeup, SAMConfiguration and InListPassiveTarget,
+# so the protocol itself re-synchronises with the target.
+SETTLE = 0.05
+
+# Read timeout shared by every command in the emulate_tag loop. Keeping it
+# the same for TgGetData and TgSetData means pyserial's timeout (a
+# tcsetattr() on POSIX) is not reassigned on each APDU.
+EMULATION_TIMEOUT = 2.0
+
+# Largest short-APDU data field that fits in one InDataExchange frame:
+# LEN(255) - TFI - CMD - Tg - APDU header (CLA INS P1 P2 Lc)
+MAX_APDU_DATA = 255 - 3 - 5
 
 BAUDRATE = 115200
 
+# InListPassiveTarget 106A target data: Tg, SENS_RES (ATQA), SEL_RES (SAK), NFCIDLength
+TARGET_A_HEADER = struct.Struct(">B2sBB")
+
+# Short C-APDU header with a 16-bit offset in P1:P2: CLA INS P1P2 Lc
+APDU_OFFSET_HEADER = struct.Struct(">BBHB")
+
+# Type 4 Capability Container: CCLEN, mapping version, MLe, MLc, then the
+# NDEF File Control TLV (T, L, file ID hi/lo, max size, read/write access)
+CC_FILE = struct.Struct(">HBHHBBBBHBB")
+
+# Big-endian 16-bit field reader: _unpack_u16(buf, offset)[0]
+_unpack_u16 = struct.Struct(">H").unpack_from
+
+
+def _write_frame(buf, cmd, params=b""):
+    """Write a PN532 normal information frame into ``buf``; return its length."""
+    n = len(params)
+    length = n + 2  # TFI + CMD + params
+    buf[0:7] = (PREAMBLE, START1, START2, length, (0x100 - length) & 0xFF,
+                TFI_HOST_TO_PN532, cmd)
+    buf[7:7 + n] = params
+    buf[7 + n] = (0x100 - TFI_HOST_TO_PN532 - cmd - sum(params)) & 0xFF
+    buf[8 + n] = POSTAMBLE
+    return n + 9
+
+
+def _frame(cmd, params=b""):
+    """Build a standalone frame (for the fixed command frames below)."""
+    buf = bytearray(len(params) + 9)
+    _write_frame(buf, cmd, params)
+    return bytes(buf)
+
+
+WAKEUP_PREAMBLE = b"\x55" * 16  # HSU wake-up sync bytes
+RESET_BOOT_TIMEOUT = 3.0  # upper bound for the PN532 to answer after a DTR reset
+WAKEUP_TIMEOUT = 1.0  # upper bound for the PN532 to answer the wakeup SAMConfiguration
+
+# Commands whose parameters never change, framed once at import
+SAM_NORMAL_FRAME = _frame(0x14, b"\x01\x00")        # SAMConfiguration: normal mode
+GET_FIRMWARE_FRAME = _frame(0x02)                    # GetFirmwareVersion
+POWER_DOWN_FRAME = _frame(0x16, b"\xF0")            # PowerDown, wake on any source
+IN_LIST_106A_FRAME = _frame(0x4A, b"\x01\x00")      # InListPassiveTarget, 1 x 106A
+IN_RELEASE_ALL_FRAME = _frame(0x44, b"\x00")        # InRelease, all targets
+RF_MAX_RETRIES_FRAME = _frame(0x32, b"\x05\xFF\x01\xFF")  # MxRtyATR, MxRtyPSL, MxRtyPassiveActivation
+RF_TIMEOUT_FRAME = _frame(0x32, b"\x02\x00\x0B\x0E")    # fRetryTimeout=0x0E (~819ms)
+TG_GET_DATA_FRAME = _frame(0x86)                     # TgGetData
+
+# Expected reply to the wakeup SAMConfiguration: ACK, then D5 15
+WAKEUP_RESPONSE = ACK_FRAME + bytes([0x00, 0x00, 0xFF, 0x02, 0xFE, 0xD5, 0x15, 0x16, 0x00])
+
+# TgInitAsTarget as an ISO14443-4 PICC, used by emulate_tag on every
+# activation attempt
+TG_INIT_PICC_FRAME = _frame(0x8C, b"".join((
+    b"\x05",                          # Mode: PassiveOnly | PICCOnly
+    b"\x04\x00",                      # SENS_RES (ATQA)
+    b"\x01\x02\x03",                  # NFCID1t (3-byte UID)
+    b"\x20",                          # SEL_RES (SAK — ISO14443-4 compliant)
+    bytes(18),                        # FeliCaParams (not used)
+    bytes(range(1, 11)),              # NFCID3t
+    b"\x00",                          # no general bytes
+    # ATS Historical Bytes — needed for Android to recognize Type 4 Tag.
+    # Format: category indicator 0x80 (status indicator only, no TLV data)
+    b"\x01\x80",                      # LEN Tk, Tk
+)))
+
+# Application identifiers
+NDEF_AID = bytes([0xD2, 0x76, 0x00, 0x00, 0x85, 0x01, 0x01])  # NFC Forum Type 4 Tag
+VAULT_AID = bytes([0xF0, 0x01, 0x02, 0x03, 0x04, 0x05])
+
+# Fixed C-APDUs
+SELECT_NDEF_AID_APDU = bytes([0x00, 0xA4, 0x04, 0x00, len(NDEF_AID)]) + NDEF_AID + b"\x00"
+SELECT_VAULT_AID_APDU = bytes([0x00, 0xA4, 0x04, 0x00, len(VAULT_AID)]) + VAULT_AID + b"\x00"
+SELECT_CC_APDU = bytes([0x00, 0xA4, 0x00, 0x0C, 0x02, 0xE1, 0x03])  # CC file E103
+READ_CC_APDU = bytes([0x00, 0xB0, 0x00, 0x00, 0x0F])
+READ_NLEN_APDU = bytes([0x00, 0xB0, 0x00, 0x00, 0x02])  # 2-byte NDEF length field
+GET_VAULT_LENGTH_APDU = bytes([0x80, 0xCA, 0x00, 0x00, 0x00])
+
+NLEN_ZERO = b"\x00\x00"  # NDEF file length field of an empty/in-progress file
+
+# Status words returned by the emulators
+SW_OK = b"\x90\x00"
+SW_WRONG_LENGTH = b"\x67\x00"
+SW_NOT_FOUND = b"\x6A\x82"  # file/application not found (also used for "denied")
+SW_INS_NOT_SUPPORTED = b"\x6D\x00"
+
 
 def _find_serial_port():
     """Auto-detect the USB-serial port for the PN532."""
-    import glob
     candidates = glob.glob("/dev/tty.usbserial-*")
     if candidates:
         return candidates[0]
@@ -47,6 +155,56 @@ class CardInfo:
     device: str = ""
     type: str = "ISO/IEC 14443A (106 kbps) target"
 
+    def to_dict(self, include_device=False):
+        """Return the card fields as a JSON-ready dict (empty ATS -> None)."""
+        info = {"uid": self.uid, "atqa": self.atqa, "sak": self.sak,
+                "ats": self.ats or None}
+        if include_device:
+            info["type"] = self.type
+            info["device"] = self.device
+        return info
+
+
+class LogEntry:
+    """One TX/RX/ERR communication log entry.
+
+    Only the raw capture time and frame bytes are recorded; the
+    HH:MM:SS.mmm local-time string and the hex dump are built when the
+    entry is read through ``time``/``data`` or serialized with to_dict(),
+    off the serial I/O path. ``raw`` keeps the frame bytes (None for text
+    entries) so consumers can filter on them without formatting.
+    """
+
+    __slots__ = ("t_ns", "direction", "raw", "_note", "_text")
+
+    def __init__(self, direction, data, t_ns=None, note=""):
+        self.t_ns = time.time_ns() if t_ns is None else t_ns
+        self.direction = direction
+        if isinstance(data, str):
+            self.raw = None
+            self._text = data + note
+        else:
+            self.raw = data
+            self._note = note
+            self._text = None  # hex rendered on first read of .data
+
+    @property
+    def data(self):
+        text = self._text
+        if text is None:
+            # Cached; entries are read repeatedly by pollers
+            text = self._text = self.raw.hex(" ") + self._note
+        return text
+
+    @property
+    def time(self):
+        secs, ns = divmod(self.t_ns, 1_000_000_000)
+        t = time.localtime(secs)
+        return f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{ns // 1_000_000:03d}"
+
+    def to_dict(self):
+        return {"time": self.time, "direction": self.direction, "data": self.data}
+
 
 class PN532:
     """PN532 NFC reader via direct UART communication."""
@@ -54,7 +212,6 @@ class PN532:
     @staticmethod
     def list_ports():
         """Return all available /dev/tty.usbserial-* ports."""
-        import glob
         return sorted(glob.glob("/dev/tty.usbserial-*"))
 
     def __init__(self, port=SERIAL_PORT, baudrate=BAUDRATE):
@@ -62,6 +219,8 @@ class PN532:
         self._baudrate = baudrate
         self._serial = None
         self._lock = threading.Lock()
+        self._frame_buf = bytearray(MAX_FRAME_LEN)  # TX scratch for _build_frame
+        self._last_exchange = 0.0  # monotonic time of the last target response
 
     def set_port(self, port):
         """Close existing connection and switch to a new serial port."""
@@ -70,98 +229,115 @@ class PN532:
             self._port = port
 
     def _build_frame(self, cmd, params=b""):
-        """Build a PN532 normal information frame."""
-        data = bytes([TFI_HOST_TO_PN532, cmd]) + bytes(params)
-        length = len(data)
-        lcs = (0x100 - length) & 0xFF
-        dcs = (0x100 - sum(data)) & 0xFF
-        return bytes([PREAMBLE, START1, START2, length, lcs]) + data + bytes([dcs, POSTAMBLE])
+        """Build a PN532 normal information frame.
+
+        The frame is written into a reusable scratch buffer and returned
+        as a memoryview that stays valid until the next call; callers hold
+        self._lock.
+        """
+        n = _write_frame(self._frame_buf, cmd, params)
+        return memoryview(self._frame_buf)[:n]
 
     def _format_hex(self, data):
         """Format bytes as space-separated hex string."""
-        return " ".join(f"{b:02x}" for b in data)
+        return data.hex(" ")
 
-    def _timestamp(self):
-        """Get current timestamp string."""
-        return datetime.now().strftime("%H:%M:%S.%f")[:-3]
+    def _log(self, logs, direction, data, note=""):
+        """Append a LogEntry to ``logs`` unless it is None.
+
+        Frame bytes are copied (the TX buffer is reused) and only rendered
+        as hex when the entry is read; str data is logged as is.
+        """
+        if logs is None:
+            return
+        if not isinstance(data, str):
+            data = bytes(data)
+        logs.append(LogEntry(direction, data, note=note))
 
     def _send_command(self, cmd, params=b"", timeout=1.0, logs=None):
         """
         Send a command frame, wait for ACK, then read the response frame.
-        Returns the response data (after TFI) or None on failure.
+        Returns the response data (a memoryview from the TFI byte on) or None on failure.
         """
-        frame = self._build_frame(cmd, params)
-
-        # Log TX
-        if logs is not None:
-            logs.append({
-                "time": self._timestamp(),
-                "direction": "TX",
-                "data": self._format_hex(frame),
-            })
-
-        self._serial.write(frame)
-        self._serial.flush()
-
-        # Read ACK (6 bytes)
-        ack = self._serial.read(6)
+        return self._send_frame(self._build_frame(cmd, params), timeout, logs)
+
+    def _send_frame(self, frame, timeout=1.0, logs=None):
+        """Send an already built command frame; see _send_command."""
+        self._log(logs, "TX", frame)
+        ser = self._serial  # looked up once; this runs for every command
+
+        # No flush(): tcdrain() would only block until the frame has left the
+        # UART, and the ACK read below waits for the PN532 anyway.
+        ser.write(frame)
+
+        # One read timeout covers the ACK, header and body reads. Setting it
+        # costs a tcsetattr() on POSIX, so only touch it when it changes.
+        if ser.timeout != timeout:
+            ser.timeout = timeout
+
+        # Read ACK + header in one go: the ACK (6 bytes) and the response
+        # frame header, PREAMBLE(1) START(2) LEN(1) LCS(1), arrive back to
+        # back, so ACK_AND_HEADER_LEN (11) bytes are read at once.
+        # pyserial's read(n) already blocks until n bytes arrive or the
+        # timeout expires.
+        head = ser.read(ACK_AND_HEADER_LEN)
+        ack = head[:6]
+        self._log(logs, "RX", ack or "(no ACK)")
         if ack != ACK_FRAME:
-            if logs is not None:
-                logs.append({
-                    "time": self._timestamp(),
-                    "direction": "RX",
-                    "data": self._format_hex(ack) if ack else "(no ACK)",
-                })
             return None
 
-        # Log ACK
-        if logs is not None:
-            logs.append({
-                "time": self._timestamp(),
-                "direction": "RX",
-                "data": self._format_hex(ack),
-            })
-
-        # Read response frame header: PREAMBLE(1) START(2) LEN(1) LCS(1) = 5 bytes
-        deadline = time.monotonic() + timeout
-        header = b""
-        while len(header) < 5 and time.monotonic() < deadline:
-            remaining = 5 - len(header)
-            self._serial.timeout = max(0.01, deadline - time.monotonic())
-            chunk = self._serial.read(remaining)
-            if chunk:
-                header += chunk
-
+        header = head[6:]
         if len(header) < 5:
             return None
 
+        if not header.startswith(FRAME_START):
+            # Line noise ahead of the frame: resync on the start code. Bytes
+            # are added one at a time and the whole buffer is checked, so a
+            # start code split across the header boundary (... 00 00 | FF)
+            # is still found and nothing past it is read.
+            limit = len(header) + MAX_RESYNC
+            while FRAME_START not in header:
+                if len(header) >= limit:
+                    return None
+                c = ser.read(1)
+                if not c:
+                    return None
+                header += c
+            header = header[header.find(FRAME_START):]
+            if len(header) < 5:
+                header += ser.read(5 - len(header))
+                if len(header) < 5:
+                    return None
+
+        # Anything read past the header while resyncing belongs to the body
+        header, body = header[:5], header[5:]
         resp_len = header[3]
+        if (resp_len + header[4]) & 0xFF:
+            # Bad LCS: the length cannot be trusted, drop whatever follows
+            self._log(logs, "RX", header, note=" (bad LCS)")
+            ser.reset_input_buffer()
+            return None
 
-        # Read DATA(resp_len) + DCS(1) + POSTAMBLE(1)
-        body = b""
+        # Read DATA(resp_len) + DCS(1) + POSTAMBLE(1); the PN532 sends the
+        # frame back to back, so this only waits out the timeout on a dead link
         to_read = resp_len + 2
-        while len(body) < to_read and time.monotonic() < deadline:
-            remaining = to_read - len(body)
-            self._serial.timeout = max(0.01, deadline - time.monotonic())
-            chunk = self._serial.read(remaining)
-            if chunk:
-                body += chunk
-
         if len(body) < to_read:
-            return None
+            body += ser.read(to_read - len(body))
+            if len(body) < to_read:
+                return None
 
-        full_response = header + body
+        full_response = memoryview(header + body)[:5 + to_read]
 
-        # Log RX
-        if logs is not None:
-            logs.append({
-                "time": self._timestamp(),
-                "direction": "RX",
-                "data": self._format_hex(full_response),
-            })
+        # DCS: TFI + data + DCS must sum to zero (mod 256)
+        if sum(full_response[5:6 + resp_len]) & 0xFF:
+            self._log(logs, "RX", full_response, note=" (bad DCS)")
+            ser.reset_input_buffer()
+            return None
 
-        # Extract data payload (skip TFI byte)
-        data_payload = body[:resp_len]
+        self._log(logs, "RX", full_response)
+
+        # Data payload (TFI onward) as a view into the response, not a copy
+        data_payload = full_response[5:5 + resp_len]
         if len(data_payload) < 1:
             return None
 
@@ -176,39 +352,35 @@ class PN532:
         them into separate writes causes the PN532 to drop the first
         command entirely, resulting in empty responses.
 
-        After the combined wakeup+SAM, a short delay allows the PN532
-        to process and respond.  The response is read and discarded so
-        the caller's next command starts with a clean buffer.
+        Stale input is dropped before the write so the reply read back is
+        the PN532's.  After the combined wakeup+SAM, the ACK and
+        SAMConfiguration response are read (waiting at most WAKEUP_TIMEOUT
+        for them) and checked.  Returns True when the PN532 answered as
+        expected, False otherwise (the input buffer is then cleared and the
+        caller's SAMConfiguration retries take over).
         """
-        # Build SAMConfiguration frame: D4 14 01 00 (normal mode, no timeout)
-        sam_data = bytes([0xD4, 0x14, 0x01, 0x00])
-        sam_len = len(sam_data)
-        sam_lcs = (0x100 - sam_len) & 0xFF
-        sam_dcs = (0x100 - sum(sam_data)) & 0xFF
-        sam_frame = bytes([0x00, 0x00, 0xFF, sam_len, sam_lcs]) + sam_data + bytes([sam_dcs, 0x00])
-
         # Combine wakeup preamble + SAMConfiguration in one write
-        wakeup_and_sam = b"\x55" * 16 + sam_frame
-
-        if logs is not None:
-            logs.append({
-                "time": self._timestamp(),
-                "direction": "TX",
-                "data": self._format_hex(wakeup_and_sam),
-            })
+        wakeup_and_sam = WAKEUP_PREAMBLE + SAM_NORMAL_FRAME
+
+        self._serial.reset_input_buffer()
+        self._log(logs, "TX", wakeup_and_sam)
         self._serial.write(wakeup_and_sam)
+        # Kept for CH340/macOS timing: the preamble must be on the wire
+        # before the reply window below starts
         self._serial.flush()
-        time.sleep(1.0)
-
-        # Read and discard wakeup SAM response (ACK + D5 15)
-        resp = self._serial.read(64)
-        if logs is not None and resp:
-            logs.append({
-                "time": self._timestamp(),
-                "direction": "RX",
-                "data": self._format_hex(resp) + " (wakeup SAM)",
-            })
+        if self._serial.timeout != WAKEUP_TIMEOUT:
+            self._serial.timeout = WAKEUP_TIMEOUT
+
+        # Read the wakeup SAM reply (ACK + D5 15); returns as soon as the
+        # whole reply is in rather than sleeping out the worst case
+        resp = self._serial.read(len(WAKEUP_RESPONSE))
+        if resp == WAKEUP_RESPONSE:
+            self._log(logs, "RX", resp, note=" (wakeup SAM)")
+            return True
+
+        self._log(logs, "RX", resp or "(no response)", note=" (wakeup failed)")
         self._serial.reset_input_buffer()
+        return False
 
     def _ensure_open(self):
         """Open serial port if not already connected.
@@ -219,7 +391,6 @@ class PN532:
         """
         if self._serial and self._serial.is_open:
             # Verify the device file still exists (catches USB unplug/replug)
-            import os
             if os.path.exists(self._port):
                 return
             # Device gone — close the stale handle so we can reopen
@@ -245,7 +416,17 @@ class PN532:
         self._serial.dtr = True   # RSTPDN LOW — assert reset
         time.sleep(0.5)
         self._serial.dtr = False  # RSTPDN HIGH — release, PN532 boots
-        time.sleep(3.0)
+
+        # Poll until the PN532 answers a command rather than always waiting
+        # out the worst-case boot time. The full GetFirmwareVersion response
+        # is read, not just the ACK, so nothing is still in flight when the
+        # buffer is cleared below.
+        wakeup_and_fw = WAKEUP_PREAMBLE + GET_FIRMWARE_FRAME
+        deadline = time.monotonic() + RESET_BOOT_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._send_frame(wakeup_and_fw, timeout=0.1) is not None:
+                break
+            self._serial.reset_input_buffer()
         self._serial.reset_input_buffer()
 
     def _close(self):
@@ -260,7 +441,7 @@ class PN532:
     def sam_configuration(self, logs=None, retries=3):
         """Configure SAM to normal mode (with retries for post-wakeup timing)."""
         for attempt in range(retries):
-            resp = self._send_command(0x14, b"\x01\x00", logs=logs)
+            resp = self._send_frame(SAM_NORMAL_FRAME, logs=logs)
             if resp is not None:
                 return resp
             # Flush stale data and wait before retrying
@@ -268,17 +449,12 @@ class PN532:
             time.sleep(0.1)
 
         # All soft retries failed — perform a DTR hard reset and retry.
-        if logs is not None:
-            logs.append({
-                "time": self._timestamp(),
-                "direction": "TX",
-                "data": "(hard reset)",
-            })
+        self._log(logs, "TX", "(hard reset)")
         self._hard_reset()
         self._wakeup(logs)
 
         for _ in range(retries):
-            resp = self._send_command(0x14, b"\x01\x00", logs=logs)
+            resp = self._send_frame(SAM_NORMAL_FRAME, logs=logs)
             if resp is not None:
                 return resp
             self._serial.reset_input_buffer()
@@ -286,18 +462,13 @@ class PN532:
 
         # Last resort: close and fully reopen the serial connection.
         # This recovers from stale file descriptors after USB replug.
-        if logs is not None:
-            logs.append({
-                "time": self._timestamp(),
-                "direction": "TX",
-                "data": "(full reconnect)",
-            })
+        self._log(logs, "TX", "(full reconnect)")
         self._close()
         self._ensure_open()
         self._wakeup(logs)
 
         for _ in range(retries):
-            resp = self._send_command(0x14, b"\x01\x00", logs=logs)
+            resp = self._send_frame(SAM_NORMAL_FRAME, logs=logs)
             if resp is not None:
                 return resp
             self._serial.reset_input_buffer()
@@ -306,7 +477,7 @@ class PN532:
 
     def get_firmware_version(self, logs=None):
         """Get firmware version. Returns (IC, Ver, Rev, Support) or None."""
-        resp = self._send_command(0x02, logs=logs)
+        resp = self._send_frame(GET_FIRMWARE_FRAME, logs=logs)
         if resp and len(resp) >= 6:
             # resp: D5 03 IC Ver Rev Support
             return resp[2], resp[3], resp[4], resp[5]
@@ -314,7 +485,13 @@ class PN532:
 
     def rf_configuration(self, item, data, logs=None):
         """Set RF configuration."""
-        return self._send_command(0x32, bytes([item]) + bytes(data), logs=logs)
+        return self._send_command(0x32, bytes((item, *data)), logs=logs)
+
+    def _configure_rf(self, logs=None):
+        """Apply the retry and timeout RFConfiguration used before every scan."""
+        self._send_frame(RF_MAX_RETRIES_FRAME, logs=logs)
+        # Longer RF timeout for PN532-to-PN532 emulation scenarios
+        self._send_frame(RF_TIMEOUT_FRAME, logs=logs)
 
     def in_list_passive_target(self, brty=0x00, timeout=3.0, logs=None):
         """
@@ -322,23 +499,30 @@ class PN532:
         brty=0x00 → ISO14443A 106kbps
         Returns response data or None.
         """
-        return self._send_command(0x4A, bytes([0x01, brty]), timeout=timeout, logs=logs)
+        if brty == 0x00:
+            resp = self._send_frame(IN_LIST_106A_FRAME, timeout=timeout, logs=logs)
+        else:
+            resp = self._send_command(0x4A, bytes((0x01, brty)), timeout=timeout, logs=logs)
+        self._last_exchange = time.monotonic()
+        return resp
 
     def in_data_exchange(self, tg, data, timeout=2.0, logs=None):
         """
         InDataExchange (0x40) — exchange data with an activated target.
         Returns response data (D5 41 Status DataOut...) or None.
         """
-        params = bytes([tg]) + bytes(data)
+        params = b"".join((bytes((tg,)), data))
         return self._send_command(0x40, params, timeout=timeout, logs=logs)
 
     def in_release(self, tg=0x00, logs=None):
         """Release target."""
-        return self._send_command(0x44, bytes([tg]), logs=logs)
+        if tg == 0x00:
+            return self._send_frame(IN_RELEASE_ALL_FRAME, logs=logs)
+        return self._send_command(0x44, bytes((tg,)), logs=logs)
 
     def power_down(self, logs=None):
         """Enter power-down mode."""
-        return self._send_command(0x16, b"\xF0", logs=logs)
+        return self._send_frame(POWER_DOWN_FRAME, logs=logs)
 
     def set_parameters(self, flags, logs=None):
         """SetParameters (0x12). flags is a single byte."""
@@ -351,14 +535,14 @@ class PN532:
         Blocks until a reader activates us or timeout expires.
         Returns response data or None.
         """
-        params = (
-            bytes([mode])
-            + bytes(mifare_params)    # 6 bytes
-            + bytes(felica_params)    # 18 bytes
-            + bytes(nfcid3t)          # 10 bytes
-            + bytes([len(gt)]) + bytes(gt)
-            + bytes([len(tk)]) + bytes(tk)
-        )
+        params = b"".join((
+            bytes((mode,)),
+            mifare_params,    # 6 bytes
+            felica_params,    # 18 bytes
+            nfcid3t,          # 10 bytes
+            bytes((len(gt),)), gt,
+            bytes((len(tk),)), tk,
+        ))
         return self._send_command(0x8C, params, timeout=timeout, logs=logs)
 
     def tg_get_data(self, timeout=60.0, logs=None):
@@ -367,14 +551,14 @@ class PN532:
         Blocks until data arrives or timeout expires.
         Returns response data (D5 87 Status DataIn...) or None.
         """
-        return self._send_command(0x86, b"", timeout=timeout, logs=logs)
+        return self._send_frame(TG_GET_DATA_FRAME, timeout=timeout, logs=logs)
 
-    def tg_set_data(self, data, logs=None):
+    def tg_set_data(self, data, timeout=1.0, logs=None):
         """
         TgSetData (0x8E) — send R-APDU to reader.
         Returns response data or None.
         """
-        return self._send_command(0x8E, bytes(data), logs=logs)
+        return self._send_command(0x8E, data, timeout=timeout, logs=logs)
 
     # -- Response parsing --
 
@@ -391,23 +575,12 @@ class PN532:
         if nb_tg == 0:
             return None
 
-        # Parse first target
+        # Parse first target: Tg, ATQA, SAK, NFCIDLength in one unpack
         if len(resp) < 8:
             return None
+        _tg, atqa, sak, uid_len = TARGET_A_HEADER.unpack_from(resp, 3)
 
-        offset = 3
-        # tg = resp[offset]
-        offset += 1
-
-        atqa = resp[offset:offset + 2]
-        offset += 2
-
-        sak = resp[offset]
-        offset += 1
-
-        uid_len = resp[offset]
-        offset += 1
-
+        offset = 8
         if len(resp) < offset + uid_len:
             return None
 
@@ -422,23 +595,24 @@ class PN532:
                 ats = resp[offset + 1:offset + ats_len]
 
         card = CardInfo(
-            uid=" ".join(f"{b:02x}" for b in uid),
-            atqa=" ".join(f"{b:02x}" for b in atqa),
+            uid=uid.hex(" "),
+            atqa=atqa.hex(" "),
             sak=f"{sak:02x}",
-            ats=" ".join(f"{b:02x}" for b in ats) if ats else "",
+            ats=ats.hex(" "),
         )
         return card
 
     # -- Top-level scan --
 
-    def scan_type_a(self):
+    def scan_type_a(self, include_raw=False):
         """
         Perform a full ISO 14443A scan sequence.
-        Returns dict with {success, cards, logs, raw_output}.
+        Returns dict with {success, cards, logs}; a plain-text summary is
+        added as ``raw_output`` only when include_raw is set.
         """
         logs = []
         cards = []
-        raw_lines = []
+        firmware = None
 
         with self._lock:
             try:
@@ -463,12 +637,9 @@ class PN532:
                 if fw:
                     ic, ver, rev, sup = fw
                     device_name = f"PN5{ic:02x} v{ver}.{rev}"
-                    raw_lines.append(f"Firmware: {device_name}")
+                    firmware = device_name
 
-                # RF Configuration — MaxRetries
-                self.rf_configuration(0x05, [0xFF, 0x01, 0xFF], logs)
-                # Longer RF timeout for PN532-to-PN532 emulation scenarios
-                self.rf_configuration(0x02, [0x00, 0x0B, 0x0E], logs)  # fRetryTimeout=0x0E (~819ms)
+                self._configure_rf(logs)
 
                 # InListPassiveTarget — ISO14443A
                 resp = self.in_list_passive_target(brty=0x00, timeout=3.0, logs=logs)
@@ -476,32 +647,28 @@ class PN532:
 
                 if card:
                     card.device = device_name
-                    cards.append({
-                        "type": card.type,
-                        "device": card.device,
-                        "uid": card.uid,
-                        "atqa": card.atqa,
-                        "sak": card.sak,
-                        "ats": card.ats if card.ats else None,
-                    })
-                    raw_lines.append(f"UID: {card.uid}")
-                    raw_lines.append(f"ATQA: {card.atqa}")
-                    raw_lines.append(f"SAK: {card.sak}")
-                    if card.ats:
-                        raw_lines.append(f"ATS: {card.ats}")
-
+                    cards.append(card.to_dict(include_device=True))
                     # Release target
                     self.in_release(logs=logs)
 
                 # Power down
                 self.power_down(logs)
 
-                return {
+                result = {
                     "success": True,
                     "cards": cards,
                     "logs": logs,
-                    "raw_output": "\n".join(raw_lines),
                 }
+                if include_raw:
+                    # Assembled only on request; callers rarely want it
+                    raw_lines = [f"Firmware: {firmware}"] if firmware else []
+                    if card:
+                        raw_lines += [f"UID: {card.uid}", f"ATQA: {card.atqa}",
+                                      f"SAK: {card.sak}"]
+                        if card.ats:
+                            raw_lines.append(f"ATS: {card.ats}")
+                    result["raw_output"] = "\n".join(raw_lines)
+                return result
 
             except serial.SerialException as e:
                 self._close()
@@ -521,6 +688,12 @@ class PN532:
 
     # -- Vault protocol reader --
 
+    def _fail(self, logs, error, card_info=None):
+        """Release the target, power down the RF field and return a failure result."""
+        self.in_release(logs=logs)
+        self.power_down(logs)
+        return {"success": False, "error": error, "card_info": card_info, "logs": logs}
+
     def read_vault_tag(self, read_offset=0, read_length=64):
         """
         Read data from a card implementing the Vault APDU protocol.
@@ -529,7 +702,6 @@ class PN532:
         Returns dict with {success, card_info, data_hex, data_text, logs}.
         """
         logs = []
-        vault_aid = bytes([0xF0, 0x01, 0x02, 0x03, 0x04, 0x05])
         max_read_chunk = 32  # PN7160 I2C@100kHz + FWI=4: FWT~4.8ms limits to ~32B/APDU
 
         with self._lock:
@@ -541,10 +713,7 @@ class PN532:
                 if resp is None:
                     return {"success": False, "error": "SAMConfiguration failed", "logs": logs}
 
-                # MaxRetries
-                self.rf_configuration(0x05, [0xFF, 0x01, 0xFF], logs)
-                # Longer RF timeout for PN532-to-PN532 emulation scenarios
-                self.rf_configuration(0x02, [0x00, 0x0B, 0x0E], logs)  # fRetryTimeout=0x0E (~819ms)
+                self._configure_rf(logs)
 
                 # Detect card
                 resp = self.in_list_passive_target(brty=0x00, timeout=3.0, logs=logs)
@@ -553,38 +722,32 @@ class PN532:
                     self.power_down(logs)
                     return {"success": False, "error": "No card detected", "logs": logs}
 
-                card_info = {
-                    "uid": card.uid,
-                    "atqa": card.atqa,
-                    "sak": card.sak,
-                    "ats": card.ats if card.ats else None,
-                }
+                card_info = card.to_dict()
 
                 tg = 0x01
 
                 # SELECT Vault AID: 00 A4 04 00 06 F0 01 02 03 04 05 00
-                select_apdu = bytes([0x00, 0xA4, 0x04, 0x00, len(vault_aid)]) + vault_aid + bytes([0x00])
-                sw1, sw2, _ = self._exchange_apdu(tg, select_apdu, logs)
+                sw1, sw2, _ = self._exchange_apdu(tg, SELECT_VAULT_AID_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT rejected (SW={sw1:02x}{sw2:02x})", "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"SELECT rejected (SW={sw1:02x}{sw2:02x})", card_info)
 
                 # READ BINARY with 16-bit offset (P1:P2), chunked if needed
-                all_data = b""
+                chunks = []
                 offset = read_offset
                 remaining = read_length
+                read_apdu = bytearray(b"\x00\xB0\x00\x00\x00")  # P1 P2 Le patched per chunk
                 while remaining > 0:
                     chunk_size = min(remaining, max_read_chunk)
-                    p1 = (offset >> 8) & 0xFF
-                    p2 = offset & 0xFF
-                    read_apdu = bytes([0x00, 0xB0, p1, p2, chunk_size & 0xFF])
+                    read_apdu[2] = (offset >> 8) & 0xFF
+                    read_apdu[3] = offset & 0xFF
+                    read_apdu[4] = chunk_size & 0xFF
                     sw1, sw2, payload = self._exchange_apdu(tg, read_apdu, logs)
                     if (sw1, sw2) != (0x90, 0x00):
                         break
-                    all_data += bytes(payload)
+                    chunks.append(payload)
                     offset += len(payload)
                     remaining -= len(payload)
+                all_data = b"".join(chunks)
 
                 data_hex = self._format_hex(all_data)
                 # Decode as text, replacing non-printable bytes
@@ -614,7 +777,6 @@ class PN532:
         Returns dict with {success, card_info, length, logs}.
         """
         logs = []
-        vault_aid = bytes([0xF0, 0x01, 0x02, 0x03, 0x04, 0x05])
 
         with self._lock:
             try:
@@ -625,8 +787,7 @@ class PN532:
                 if resp is None:
                     return {"success": False, "error": "SAMConfiguration failed", "logs": logs}
 
-                self.rf_configuration(0x05, [0xFF, 0x01, 0xFF], logs)
-                self.rf_configuration(0x02, [0x00, 0x0B, 0x0E], logs)
+                self._configure_rf(logs)
 
                 resp = self.in_list_passive_target(brty=0x00, timeout=3.0, logs=logs)
                 card = self._parse_14443a_target(resp)
@@ -634,26 +795,17 @@ class PN532:
                     self.power_down(logs)
                     return {"success": False, "error": "No card detected", "logs": logs}
 
-                card_info = {
-                    "uid": card.uid,
-                    "atqa": card.atqa,
-                    "sak": card.sak,
-                    "ats": card.ats if card.ats else None,
-                }
+                card_info = card.to_dict()
 
                 tg = 0x01
 
                 # SELECT Vault AID
-                select_apdu = bytes([0x00, 0xA4, 0x04, 0x00, len(vault_aid)]) + vault_aid + bytes([0x00])
-                sw1, sw2, _ = self._exchange_apdu(tg, select_apdu, logs)
+                sw1, sw2, _ = self._exchange_apdu(tg, SELECT_VAULT_AID_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT rejected (SW={sw1:02x}{sw2:02x})", "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"SELECT rejected (SW={sw1:02x}{sw2:02x})", card_info)
 
                 # GET DATA LENGTH: 80 CA 00 00 Le=00 (expect up to 256 bytes)
-                get_len_apdu = bytes([0x80, 0xCA, 0x00, 0x00, 0x00])
-                sw1, sw2, payload = self._exchange_apdu(tg, get_len_apdu, logs)
+                sw1, sw2, payload = self._exchange_apdu(tg, GET_VAULT_LENGTH_APDU, logs)
 
                 self.in_release(logs=logs)
                 self.power_down(logs)
@@ -661,7 +813,7 @@ class PN532:
                 if (sw1, sw2) != (0x90, 0x00) or len(payload) < 2:
                     return {"success": False, "error": f"GET LENGTH failed (SW={sw1:02x}{sw2:02x})", "card_info": card_info, "logs": logs}
 
-                length = (payload[0] << 8) | payload[1]
+                length = _unpack_u16(payload)[0]
                 return {
                     "success": True,
                     "card_info": card_info,
@@ -683,7 +835,6 @@ class PN532:
         Returns dict with {success, card_info, logs}.
         """
         logs = []
-        vault_aid = bytes([0xF0, 0x01, 0x02, 0x03, 0x04, 0x05])
         max_write_chunk = 32  # PN7160 I2C@100kHz + FWI=4: FWT~4.8ms limits to ~32B/APDU
 
         with self._lock:
@@ -695,9 +846,7 @@ class PN532:
                 if resp is None:
                     return {"success": False, "error": "SAMConfiguration failed", "logs": logs}
 
-                self.rf_configuration(0x05, [0xFF, 0x01, 0xFF], logs)
-                # Longer RF timeout for PN532-to-PN532 emulation scenarios
-                self.rf_configuration(0x02, [0x00, 0x0B, 0x0E], logs)  # fRetryTimeout=0x0E (~819ms)
+                self._configure_rf(logs)
 
                 resp = self.in_list_passive_target(brty=0x00, timeout=3.0, logs=logs)
                 card = self._parse_14443a_target(resp)
@@ -705,37 +854,26 @@ class PN532:
                     self.power_down(logs)
                     return {"success": False, "error": "No card detected", "logs": logs}
 
-                card_info = {
-                    "uid": card.uid,
-                    "atqa": card.atqa,
-                    "sak": card.sak,
-                    "ats": card.ats if card.ats else None,
-                }
+                card_info = card.to_dict()
 
                 tg = 0x01
 
                 # SELECT Vault AID
-                select_apdu = bytes([0x00, 0xA4, 0x04, 0x00, len(vault_aid)]) + vault_aid + bytes([0x00])
-                sw1, sw2, _ = self._exchange_apdu(tg, select_apdu, logs)
+                sw1, sw2, _ = self._exchange_apdu(tg, SELECT_VAULT_AID_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT rejected (SW={sw1:02x}{sw2:02x})", "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"SELECT rejected (SW={sw1:02x}{sw2:02x})", card_info)
 
                 # WRITE with 16-bit offset (P1:P2), chunked if needed
                 offset = write_offset
-                remaining_data = data_bytes
-                while remaining_data:
-                    chunk = remaining_data[:max_write_chunk]
-                    remaining_data = remaining_data[max_write_chunk:]
-                    p1 = (offset >> 8) & 0xFF
-                    p2 = offset & 0xFF
-                    write_apdu = bytes([0x00, 0xD0, p1, p2, len(chunk)]) + chunk
-                    sw1, sw2, _ = self._exchange_apdu(tg, write_apdu, logs)
+                data = memoryview(data_bytes)
+                write_apdu = bytearray(5 + max_write_chunk)  # reused for every chunk
+                for start in range(0, len(data), max_write_chunk):
+                    chunk = data[start:start + max_write_chunk]
+                    APDU_OFFSET_HEADER.pack_into(write_apdu, 0, 0x00, 0xD0, offset, len(chunk))
+                    write_apdu[5:5 + len(chunk)] = chunk
+                    sw1, sw2, _ = self._exchange_apdu(tg, memoryview(write_apdu)[:5 + len(chunk)], logs)
                     if (sw1, sw2) != (0x90, 0x00):
-                        self.in_release(logs=logs)
-                        self.power_down(logs)
-                        return {"success": False, "error": f"WRITE failed at offset {offset} (SW={sw1:02x}{sw2:02x})", "card_info": card_info, "logs": logs}
+                        return self._fail(logs, f"WRITE failed at offset {offset} (SW={sw1:02x}{sw2:02x})", card_info)
                     offset += len(chunk)
 
                 self.in_release(logs=logs)
@@ -761,17 +899,21 @@ class PN532:
         Send an APDU via InDataExchange.
         Handles ISO-DEP CID framing leak (PN532-to-PN532 workaround)
         and retries on short responses (e.g. HCE routing delay).
-        Returns (sw1, sw2, payload) or raises RuntimeError on failure.
+        Returns (sw1, sw2, payload) or raises RuntimeError on failure;
+        payload is a memoryview into the response frame.
 
         strip_cid: Only enable for known PN532-to-PN532 scenarios where
         raw ISO-DEP I-blocks with CID leak through. Must NOT be used
         with PN7160 or other NFC controllers whose ATS TC1 CID bit=0.
         """
         for attempt in range(1 + retries):
-            # Small delay between consecutive APDUs to give emulated cards
-            # (PN532 target) time to loop back from TgSetData to TgGetData.
-            time.sleep(0.02)
+            # Keep APDU_GAP between consecutive APDUs for emulated cards, but
+            # only wait out what has not already elapsed since the last one.
+            wait = APDU_GAP - (time.monotonic() - self._last_exchange)
+            if wait > 0:
+                time.sleep(wait)
             resp = self.in_data_exchange(tg, apdu, timeout=2.0, logs=logs)
+            self._last_exchange = time.monotonic()
             if resp is None or len(resp) < 3:
                 raise RuntimeError("No response from card")
             status = resp[2]
@@ -809,7 +951,6 @@ class PN532:
         Returns dict with {success, card_info, ndef_records, raw_hex, logs}.
         """
         logs = []
-        ndef_aid = bytes([0xD2, 0x76, 0x00, 0x00, 0x85, 0x01, 0x01])
 
         with self._lock:
             try:
@@ -820,9 +961,7 @@ class PN532:
                 if resp is None:
                     return {"success": False, "error": "SAMConfiguration failed", "logs": logs}
 
-                self.rf_configuration(0x05, [0xFF, 0x01, 0xFF], logs)
-                # Longer RF timeout for PN532-to-PN532 emulation scenarios
-                self.rf_configuration(0x02, [0x00, 0x0B, 0x0E], logs)  # fRetryTimeout=0x0E (~819ms)
+                self._configure_rf(logs)
 
                 # Detect card
                 resp = self.in_list_passive_target(brty=0x00, timeout=3.0, logs=logs)
@@ -831,86 +970,68 @@ class PN532:
                     self.power_down(logs)
                     return {"success": False, "error": "No card detected", "logs": logs}
 
-                card_info = {
-                    "uid": card.uid,
-                    "atqa": card.atqa,
-                    "sak": card.sak,
-                    "ats": card.ats if card.ats else None,
-                }
+                card_info = card.to_dict()
 
                 tg = 0x01
 
                 # 1) SELECT NDEF Tag Application
-                select_aid = bytes([0x00, 0xA4, 0x04, 0x00, len(ndef_aid)]) + ndef_aid + bytes([0x00])
-                sw1, sw2, _ = self._exchange_apdu(tg, select_aid, logs)
+                sw1, sw2, _ = self._exchange_apdu(tg, SELECT_NDEF_AID_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT NDEF AID failed (SW={sw1:02x}{sw2:02x})",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"SELECT NDEF AID failed (SW={sw1:02x}{sw2:02x})", card_info)
 
                 # 2) SELECT CC file (E103)
-                select_cc = bytes([0x00, 0xA4, 0x00, 0x0C, 0x02, 0xE1, 0x03])
-                sw1, sw2, _ = self._exchange_apdu(tg, select_cc, logs)
+                sw1, sw2, _ = self._exchange_apdu(tg, SELECT_CC_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT CC failed (SW={sw1:02x}{sw2:02x})",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"SELECT CC failed (SW={sw1:02x}{sw2:02x})", card_info)
 
                 # READ CC (15 bytes)
-                read_cc = bytes([0x00, 0xB0, 0x00, 0x00, 0x0F])
-                sw1, sw2, cc_data = self._exchange_apdu(tg, read_cc, logs)
+                sw1, sw2, cc_data = self._exchange_apdu(tg, READ_CC_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00) or len(cc_data) < 15:
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": "READ CC failed",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, "READ CC failed", card_info)
 
-                # Parse CC: bytes 9-10 = NDEF file ID, bytes 11-12 = max NDEF size
-                ndef_file_id_hi = cc_data[9]
-                ndef_file_id_lo = cc_data[10]
-                ndef_max_size = (cc_data[11] << 8) | cc_data[12]
+                # Parse CC: NDEF file ID and max NDEF size from the File Control TLV
+                (_, _, _, _, _, _, ndef_file_id_hi, ndef_file_id_lo,
+                 ndef_max_size, _, _) = CC_FILE.unpack_from(cc_data)
 
                 # 3) SELECT NDEF file
                 select_ndef = bytes([0x00, 0xA4, 0x00, 0x0C, 0x02, ndef_file_id_hi, ndef_file_id_lo])
                 sw1, sw2, _ = self._exchange_apdu(tg, select_ndef, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT NDEF file failed (SW={sw1:02x}{sw2:02x})",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"SELECT NDEF file failed (SW={sw1:02x}{sw2:02x})", card_info)
 
                 # READ first 2 bytes — NDEF message length
-                read_len = bytes([0x00, 0xB0, 0x00, 0x00, 0x02])
-                sw1, sw2, len_data = self._exchange_apdu(tg, read_len, logs)
+                sw1, sw2, len_data = self._exchange_apdu(tg, READ_NLEN_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00) or len(len_data) < 2:
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": "READ NDEF length failed",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, "READ NDEF length failed", card_info)
 
-                ndef_msg_len = (len_data[0] << 8) | len_data[1]
+                ndef_msg_len = _unpack_u16(len_data)[0]
                 if ndef_msg_len == 0:
                     self.in_release(logs=logs)
                     self.power_down(logs)
                     return {"success": True, "card_info": card_info,
                             "ndef_records": [], "raw_hex": "", "logs": logs}
 
-                # READ NDEF message body (offset=2, chunked if needed)
-                ndef_bytes = b""
+                # READ NDEF message body (offset=2, chunked if needed) into a
+                # buffer sized from NLEN
+                ndef_bytes = bytearray(ndef_msg_len)
+                pos = 0
                 offset = 2
                 remaining = ndef_msg_len
                 max_read = 59  # typical MLe for Type 4 Tags
+                read_msg = bytearray(b"\x00\xB0\x00\x00\x00")  # P1 P2 Le patched per chunk
                 while remaining > 0:
                     chunk_size = min(remaining, max_read)
-                    read_msg = bytes([0x00, 0xB0, (offset >> 8) & 0xFF, offset & 0xFF, chunk_size])
+                    read_msg[2] = (offset >> 8) & 0xFF
+                    read_msg[3] = offset & 0xFF
+                    read_msg[4] = chunk_size
                     sw1, sw2, chunk = self._exchange_apdu(tg, read_msg, logs)
-                    if (sw1, sw2) != (0x90, 0x00):
+                    if (sw1, sw2) != (0x90, 0x00) or not chunk:
                         break
-                    ndef_bytes += bytes(chunk)
+                    ndef_bytes[pos:pos + len(chunk)] = chunk
+                    pos += len(chunk)
                     offset += len(chunk)
                     remaining -= len(chunk)
+                del ndef_bytes[pos:]  # short read: keep only what arrived
 
                 self.in_release(logs=logs)
                 self.power_down(logs)
@@ -919,15 +1040,15 @@ class PN532:
                 raw_hex = self._format_hex(ndef_bytes)
                 ndef_records = []
                 try:
-                    import ndef as ndef_lib
-                    for record in ndef_lib.message_decoder(ndef_bytes):
+                    for record in ndef.message_decoder(ndef_bytes):
                         rec_info = {"type": record.type, "tnf": record._type_name_format}
-                        if hasattr(record, 'uri'):
-                            rec_info["value"] = record.uri
-                        elif hasattr(record, 'text'):
-                            rec_info["value"] = record.text
-                        else:
-                            rec_info["value"] = self._format_hex(record.data) if hasattr(record, 'data') else str(record)
+                        value = getattr(record, 'uri', None)
+                        if value is None:
+                            value = getattr(record, 'text', None)
+                        if value is None:
+                            data = getattr(record, 'data', None)
+                            value = self._format_hex(data) if data is not None else str(record)
+                        rec_info["value"] = value
                         ndef_records.append(rec_info)
                 except Exception:
                     ndef_records = [{"type": "raw", "value": raw_hex}]
@@ -961,7 +1082,6 @@ class PN532:
         Returns dict with {success, card_info, logs}.
         """
         logs = []
-        ndef_aid = bytes([0xD2, 0x76, 0x00, 0x00, 0x85, 0x01, 0x01])
 
         with self._lock:
             try:
@@ -972,9 +1092,7 @@ class PN532:
                 if resp is None:
                     return {"success": False, "error": "SAMConfiguration failed", "logs": logs}
 
-                self.rf_configuration(0x05, [0xFF, 0x01, 0xFF], logs)
-                # Longer RF timeout for PN532-to-PN532 emulation scenarios
-                self.rf_configuration(0x02, [0x00, 0x0B, 0x0E], logs)  # fRetryTimeout=0x0E (~819ms)
+                self._configure_rf(logs)
 
                 resp = self.in_list_passive_target(brty=0x00, timeout=3.0, logs=logs)
                 card = self._parse_14443a_target(resp)
@@ -982,97 +1100,61 @@ class PN532:
                     self.power_down(logs)
                     return {"success": False, "error": "No card detected", "logs": logs}
 
-                card_info = {
-                    "uid": card.uid,
-                    "atqa": card.atqa,
-                    "sak": card.sak,
-                    "ats": card.ats if card.ats else None,
-                }
+                card_info = card.to_dict()
 
                 tg = 0x01
 
                 # 1) SELECT NDEF Tag Application
-                select_aid = bytes([0x00, 0xA4, 0x04, 0x00, len(ndef_aid)]) + ndef_aid + bytes([0x00])
-                sw1, sw2, _ = self._exchange_apdu(tg, select_aid, logs)
+                sw1, sw2, _ = self._exchange_apdu(tg, SELECT_NDEF_AID_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT NDEF AID failed (SW={sw1:02x}{sw2:02x})",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"SELECT NDEF AID failed (SW={sw1:02x}{sw2:02x})", card_info)
 
                 # 2) SELECT CC file (E103), READ CC
-                select_cc = bytes([0x00, 0xA4, 0x00, 0x0C, 0x02, 0xE1, 0x03])
-                sw1, sw2, _ = self._exchange_apdu(tg, select_cc, logs)
+                sw1, sw2, _ = self._exchange_apdu(tg, SELECT_CC_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT CC failed (SW={sw1:02x}{sw2:02x})",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"SELECT CC failed (SW={sw1:02x}{sw2:02x})", card_info)
 
-                read_cc = bytes([0x00, 0xB0, 0x00, 0x00, 0x0F])
-                sw1, sw2, cc_data = self._exchange_apdu(tg, read_cc, logs)
+                sw1, sw2, cc_data = self._exchange_apdu(tg, READ_CC_APDU, logs)
                 if (sw1, sw2) != (0x90, 0x00) or len(cc_data) < 15:
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": "READ CC failed",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, "READ CC failed", card_info)
 
                 # Parse CC
-                ndef_file_id_hi = cc_data[9]
-                ndef_file_id_lo = cc_data[10]
-                ndef_max_size = (cc_data[11] << 8) | cc_data[12]
-                write_access = cc_data[14]
+                (_, _, _, mlc, _, _, ndef_file_id_hi, ndef_file_id_lo,
+                 ndef_max_size, _, write_access) = CC_FILE.unpack_from(cc_data)
+                if mlc < 1:
+                    return self._fail(logs, f"Invalid MLc in CC ({mlc})", card_info)
 
                 if write_access != 0x00:
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"Write access denied (0x{write_access:02x})",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"Write access denied (0x{write_access:02x})", card_info)
 
                 # NDEF file = 2-byte length prefix + message body
                 ndef_file_content = struct.pack(">H", len(ndef_msg_bytes)) + ndef_msg_bytes
                 if len(ndef_file_content) > ndef_max_size:
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"Message too large ({len(ndef_msg_bytes)} bytes, max {ndef_max_size - 2})",
-                            "card_info": card_info, "logs": logs}
+                    return self._fail(logs, f"Message too large ({len(ndef_msg_bytes)} bytes, max {ndef_max_size - 2})", card_info)
 
                 # 3) SELECT NDEF file
                 select_ndef = bytes([0x00, 0xA4, 0x00, 0x0C, 0x02, ndef_file_id_hi, ndef_file_id_lo])
                 sw1, sw2, _ = self._exchange_apdu(tg, select_ndef, logs)
                 if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"SELECT NDEF file failed (SW={sw1:02x}{sw2:02x})",
-                            "card_info": card_info, "logs": logs}
-
-                # 4) UPDATE BINARY: write length = 0 (mark empty during write)
-                update_zero = bytes([0x00, 0xD6, 0x00, 0x00, 0x02, 0x00, 0x00])
-                sw1, sw2, _ = self._exchange_apdu(tg, update_zero, logs)
-                if (sw1, sw2) != (0x90, 0x00):
-                    self.in_release(logs=logs)
-                    self.power_down(logs)
-                    return {"success": False, "error": f"UPDATE BINARY (reset length) failed (SW={sw1:02x}{sw2:02x})",
-                            "card_info": card_info, "logs": logs}
-
-                # 5) UPDATE BINARY: write NDEF message body (offset=2, chunked)
-                mlc = (cc_data[5] << 8) | cc_data[6]  # max write size from CC
-                max_write = min(mlc, 52)  # conservative chunk size
-                offset = 2
-                remaining_data = ndef_msg_bytes
-                while remaining_data:
-                    chunk = remaining_data[:max_write]
-                    remaining_data = remaining_data[max_write:]
-                    update_cmd = bytes([0x00, 0xD6, (offset >> 8) & 0xFF, offset & 0xFF, len(chunk)]) + chunk
-                    sw1, sw2, _ = self._exchange_apdu(tg, update_cmd, logs)
+                    return self._fail(logs, f"SELECT NDEF file failed (SW={sw1:02x}{sw2:02x})", card_info)
+
+                # 4) UPDATE BINARY: write NLEN = 0 (mark empty during write)
+                #    followed by the NDEF message body, chunked from offset 0 so
+                #    the length reset rides in the first data APDU
+                max_write = min(mlc, MAX_APDU_DATA)  # MLc from CC
+                offset = 0
+                data = memoryview(NLEN_ZERO + ndef_msg_bytes)
+                update_cmd = bytearray(5 + max_write)  # reused for every chunk
+                for start in range(0, len(data), max_write):
+                    chunk = data[start:start + max_write]
+                    APDU_OFFSET_HEADER.pack_into(update_cmd, 0, 0x00, 0xD6, offset, len(chunk))
+                    update_cmd[5:5 + len(chunk)] = chunk
+                    sw1, sw2, _ = self._exchange_apdu(tg, memoryview(update_cmd)[:5 + len(chunk)], logs)
                     if (sw1, sw2) != (0x90, 0x00):
-                        self.in_release(logs=logs)
-                        self.power_down(logs)
-                        return {"success": False, "error": f"UPDATE BINARY (data) failed at offset {offset} (SW={sw1:02x}{sw2:02x})",
-                                "card_info": card_info, "logs": logs}
+                        return self._fail(logs, f"UPDATE BINARY (data) failed at offset {offset} (SW={sw1:02x}{sw2:02x})", card_info)
                     offset += len(chunk)
 
-                # 6) UPDATE BINARY: write actual NDEF message length
+                # 5) UPDATE BINARY: write actual NDEF message length
                 len_bytes = struct.pack(">H", len(ndef_msg_bytes))
                 update_len = bytes([0x00, 0xD6, 0x00, 0x00, 0x02]) + len_bytes
                 sw1, sw2, _ = self._exchange_apdu(tg, update_len, logs)
@@ -1105,40 +1187,33 @@ class PN532:
         """
         Emulate an NFC tag using the given APDU emulator.
         Runs until stop_event is set or an unrecoverable error occurs.
-        Appends log dicts to the ``logs`` deque (thread-safe via caller's lock).
+        Log entries are collected per command round trip and handed to
+        ``logs`` in one extend() call, so a locking sink is entered once
+        per exchange rather than once per frame.
 
         emulator: object with handle_apdu(apdu) -> bytes method.
         stop_event: threading.Event signalling when to stop.
-        logs: collections.deque to append log entries to.
+        logs: thread-safe sink with extend() (e.g. a collections.deque).
         """
 
-        # TgInitAsTarget parameters for ISO14443-4 PICC
-        mode = 0x05  # PassiveOnly | PICCOnly
-        mifare_params = bytes([
-            0x04, 0x00,        # SENS_RES (ATQA)
-            0x01, 0x02, 0x03,  # NFCID1t (3-byte UID)
-            0x20,              # SEL_RES (SAK — ISO14443-4 compliant)
-        ])
-        felica_params = bytes(18)  # not used
-        nfcid3t = bytes([0x01, 0x02, 0x03, 0x04, 0x05,
-                         0x06, 0x07, 0x08, 0x09, 0x0A])
-        # ATS Historical Bytes — needed for Android to recognize Type 4 Tag.
-        # Format: category indicator 0x80 (status indicator only, no TLV data)
-        tk = bytes([0x80])
+        batch = []
+
+        def flush():
+            if batch:
+                logs.extend(batch)
+                batch.clear()
 
         with self._lock:
             try:
                 self._ensure_open()
-                self._wakeup(logs)
-                self.sam_configuration(logs)
-                self.set_parameters(0x24, logs)  # fAutomaticATR_RES | fISO14443-4_PICC
+                self._wakeup(batch)
+                self.sam_configuration(batch)
+                self.set_parameters(0x24, batch)  # fAutomaticATR_RES | fISO14443-4_PICC
 
                 while not stop_event.is_set():
+                    flush()
                     # Wait for reader activation
-                    resp = self.tg_init_as_target(
-                        mode, mifare_params, felica_params, nfcid3t,
-                        tk=tk, timeout=2.0, logs=logs,
-                    )
+                    resp = self._send_frame(TG_INIT_PICC_FRAME, timeout=EMULATION_TIMEOUT, logs=batch)
                     if resp is None:
                         # Timeout — no reader yet, loop and retry
                         continue
@@ -1146,7 +1221,8 @@ class PN532:
                     # Activated — handle APDU exchange loop
                     consecutive_timeouts = 0
                     while not stop_event.is_set():
-                        resp = self.tg_get_data(timeout=2.0, logs=logs)
+                        flush()
+                        resp = self.tg_get_data(timeout=EMULATION_TIMEOUT, logs=batch)
                         if resp is None:
                             consecutive_timeouts += 1
                             if consecutive_timeouts >= 3:
@@ -1165,7 +1241,7 @@ class PN532:
 
                         c_apdu = resp[3:]
                         r_apdu = emulator.handle_apdu(c_apdu)
-                        send_resp = self.tg_set_data(r_apdu, logs=logs)
+                        send_resp = self.tg_set_data(r_apdu, timeout=EMULATION_TIMEOUT, logs=batch)
                         if send_resp is None:
                             break
                         # Check TgSetData status
@@ -1174,17 +1250,11 @@ class PN532:
 
             except serial.SerialException as e:
                 self._close()
-                logs.append({
-                    "time": self._timestamp(),
-                    "direction": "ERR",
-                    "data": f"Serial error: {e}",
-                })
+                self._log(batch, "ERR", f"Serial error: {e}")
             except Exception as e:
-                logs.append({
-                    "time": self._timestamp(),
-                    "direction": "ERR",
-                    "data": f"Error: {e}",
-                })
+                self._log(batch, "ERR", f"Error: {e}")
+            finally:
+                flush()
 
 
 class Type4TagEmulator:
@@ -1201,7 +1271,7 @@ class Type4TagEmulator:
     def __init__(self, ndef_message_bytes):
         self._ndef_msg = bytes(ndef_message_bytes)
         # NDEF file contents: 2-byte big-endian length prefix + message
-        self._ndef_file = struct.pack(">H", len(self._ndef_msg)) + self._ndef_msg
+        self._ndef_file = len(self._ndef_msg).to_bytes(2, "big") + self._ndef_msg
         ndef_max_size = len(self._ndef_file)
 
         # Capability Container (15 bytes)
@@ -1212,73 +1282,78 @@ class Type4TagEmulator:
             0x00, 0x34,        # MLc (max write = 52)
             0x04, 0x06,        # NDEF File Control TLV: type=0x04, length=6
             0xE1, 0x04,        # NDEF file ID
-        ]) + struct.pack(">H", ndef_max_size) + bytes([
+        ]) + ndef_max_size.to_bytes(2, "big") + bytes([
             0x00,              # Read access: free
             0xFF,              # Write access: denied
         ])
 
         self._selected_file = None
 
+        # INS -> handler; anything else is answered with "INS not supported"
+        self._handlers = {
+            0xA4: self._handle_select,         # SELECT
+            0xB0: self._handle_read_binary,    # READ BINARY
+            0xD6: self._handle_update_binary,  # UPDATE BINARY
+        }
+
     def handle_apdu(self, apdu):
         """
         Process a C-APDU and return the R-APDU bytes.
         """
         if len(apdu) < 4:
-            return bytes([0x6D, 0x00])  # INS not supported
+            return SW_INS_NOT_SUPPORTED
 
-        cla, ins, p1, p2 = apdu[0], apdu[1], apdu[2], apdu[3]
-
-        if ins == 0xA4:  # SELECT
-            return self._handle_select(apdu)
-        elif ins == 0xB0:  # READ BINARY
-            return self._handle_read_binary(apdu)
-        elif ins == 0xD6:  # UPDATE BINARY
-            return bytes([0x6A, 0x82])  # write denied
-        else:
-            return bytes([0x6D, 0x00])  # INS not supported
+        handler = self._handlers.get(apdu[1])
+        if handler is None:
+            return SW_INS_NOT_SUPPORTED
+        return handler(apdu)
 
     def _handle_select(self, apdu):
         """Handle SELECT command."""
         if len(apdu) < 5:
-            return bytes([0x6A, 0x82])
+            return SW_NOT_FOUND
 
-        p1, p2 = apdu[2], apdu[3]
-        lc = apdu[4]
-        data = apdu[5:5 + lc]
+        p1 = apdu[2]
+        # Length of the data field actually present (Lc may overstate it);
+        # fields are compared in place instead of slicing them out first
+        data_len = min(apdu[4], len(apdu) - 5)
 
         # SELECT by AID (P1=0x04)
         if p1 == 0x04:
-            ndef_aid = bytes([0xD2, 0x76, 0x00, 0x00, 0x85, 0x01, 0x01])
-            if data == ndef_aid:
-                return bytes([0x90, 0x00])
-            return bytes([0x6A, 0x82])  # application not found
+            if data_len == len(NDEF_AID) and apdu[5:12] == NDEF_AID:
+                return SW_OK
+            return SW_NOT_FOUND  # application not found
 
         # SELECT by File ID (P1=0x00)
-        if p1 == 0x00 and len(data) == 2:
-            file_id = (data[0] << 8) | data[1]
+        if p1 == 0x00 and data_len == 2:
+            file_id = _unpack_u16(apdu, 5)[0]
+            # Keep a view so READ BINARY can slice without copying
             if file_id == self.CC_FILE_ID:
-                self._selected_file = self._cc_file
-                return bytes([0x90, 0x00])
+                self._selected_file = memoryview(self._cc_file)
+                return SW_OK
             elif file_id == self.NDEF_FILE_ID:
-                self._selected_file = self._ndef_file
-                return bytes([0x90, 0x00])
-            return bytes([0x6A, 0x82])  # file not found
+                self._selected_file = memoryview(self._ndef_file)
+                return SW_OK
+            return SW_NOT_FOUND  # file not found
+
+        return SW_NOT_FOUND
 
-        return bytes([0x6A, 0x82])
+    def _handle_update_binary(self, apdu):
+        """Handle UPDATE BINARY command (the emulated tag is read-only)."""
+        return SW_NOT_FOUND  # write denied
 
     def _handle_read_binary(self, apdu):
         """Handle READ BINARY command."""
         if self._selected_file is None:
-            return bytes([0x6A, 0x82])  # no file selected
+            return SW_NOT_FOUND  # no file selected
 
-        offset = (apdu[2] << 8) | apdu[3]
+        offset = _unpack_u16(apdu, 2)[0]
         le = apdu[4] if len(apdu) > 4 else 0
 
         if offset > len(self._selected_file):
-            return bytes([0x6A, 0x82])
+            return SW_NOT_FOUND
 
-        chunk = self._selected_file[offset:offset + le]
-        return chunk + bytes([0x90, 0x00])
+        return b"".join((self._selected_file[offset:offset + le], SW_OK))
 
 
 class VaultTagEmulator:
@@ -1289,7 +1364,7 @@ class VaultTagEmulator:
     WRITE (INS=0xD0, 16-bit offset), and GET DATA LENGTH (80 CA).
     """
 
-    VAULT_AID = bytes([0xF0, 0x01, 0x02, 0x03, 0x04, 0x05])
+    VAULT_AID = VAULT_AID
     BUFFER_SIZE = 2048
 
     def __init__(self, initial_data=b""):
@@ -1299,76 +1374,80 @@ class VaultTagEmulator:
         self._valid_len = n
         self._selected = False
 
+        # INS -> handler; anything else is answered with "INS not supported"
+        self._handlers = {
+            0xA4: self._handle_select,      # SELECT
+            0xB0: self._handle_read,        # READ BINARY
+            0xD0: self._handle_write,       # WRITE (Vault)
+            0xCA: self._handle_get_length,  # GET DATA LENGTH (CLA 0x80)
+        }
+
     def handle_apdu(self, apdu):
         """Process a C-APDU and return the R-APDU bytes."""
         if len(apdu) < 4:
-            return bytes([0x6D, 0x00])  # INS not supported
-
-        cla = apdu[0]
-        ins = apdu[1]
-        if ins == 0xA4:   # SELECT
-            return self._handle_select(apdu)
-        elif ins == 0xB0:  # READ BINARY
-            return self._handle_read(apdu)
-        elif ins == 0xD0:  # WRITE (Vault)
-            return self._handle_write(apdu)
-        elif cla == 0x80 and ins == 0xCA:  # GET DATA LENGTH
-            return self._handle_get_length()
-        else:
-            return bytes([0x6D, 0x00])  # INS not supported
+            return SW_INS_NOT_SUPPORTED
+
+        handler = self._handlers.get(apdu[1])
+        if handler is None:
+            return SW_INS_NOT_SUPPORTED
+        return handler(apdu)
 
     def _handle_select(self, apdu):
         """Handle SELECT command — match Vault AID."""
         if len(apdu) < 5:
-            return bytes([0x6A, 0x82])
+            return SW_NOT_FOUND
 
-        p1 = apdu[2]
+        # Reject wrong P1, a too-short Lc or a foreign first AID byte (e.g.
+        # the NDEF AID or PPSE) before slicing the AID out
         lc = apdu[4]
-        data = apdu[5:5 + lc]
+        if (apdu[2] != 0x04 or lc < len(self.VAULT_AID)
+                or len(apdu) <= 5 or apdu[5] != self.VAULT_AID[0]):
+            return SW_NOT_FOUND
 
-        if p1 == 0x04 and data == self.VAULT_AID:
+        if apdu[5:5 + lc] == self.VAULT_AID:
             self._selected = True
-            return bytes([0x90, 0x00])
+            return SW_OK
 
-        return bytes([0x6A, 0x82])  # application not found
+        return SW_NOT_FOUND  # application not found
 
     def _handle_read(self, apdu):
         """Handle READ BINARY — P1:P2 = 16-bit offset, Le=length."""
         if not self._selected:
-            return bytes([0x6A, 0x82])
+            return SW_NOT_FOUND
 
-        offset = (apdu[2] << 8) | apdu[3]
+        offset = _unpack_u16(apdu, 2)[0]
         le = apdu[4] if len(apdu) > 4 else 0
 
         if offset >= self.BUFFER_SIZE:
-            return bytes([0x6A, 0x82])
+            return SW_NOT_FOUND
 
-        chunk = bytes(self._buffer[offset:offset + le])
-        return chunk + bytes([0x90, 0x00])
+        return b"".join((memoryview(self._buffer)[offset:offset + le], SW_OK))
 
     def _handle_write(self, apdu):
         """Handle WRITE (INS=0xD0) — P1:P2 = 16-bit offset, data follows."""
         if not self._selected:
-            return bytes([0x6A, 0x82])
+            return SW_NOT_FOUND
 
-        offset = (apdu[2] << 8) | apdu[3]
+        offset = _unpack_u16(apdu, 2)[0]
         if len(apdu) < 5:
-            return bytes([0x67, 0x00])  # wrong length
+            return SW_WRONG_LENGTH
 
         lc = apdu[4]
         data = apdu[5:5 + lc]
 
         if offset + len(data) > self.BUFFER_SIZE:
-            return bytes([0x6A, 0x82])  # out of range
+            return SW_NOT_FOUND  # out of range
 
         self._buffer[offset:offset + len(data)] = data
         new_end = offset + len(data)
         if new_end > self._valid_len:
             self._valid_len = new_end
-        return bytes([0x90, 0x00])
+        return SW_OK
 
-    def _handle_get_length(self):
+    def _handle_get_length(self, apdu):
         """Handle GET DATA LENGTH (80 CA) — returns 2-byte big-endian valid data length."""
+        if apdu[0] != 0x80:
+            return SW_INS_NOT_SUPPORTED  # INS not supported for this CLA
         if not self._selected:
-            return bytes([0x6A, 0x82])
+            return SW_NOT_FOUND
         return bytes([(self._valid_len >> 8) & 0xFF, self._valid_len & 0xFF, 0x90, 0x00])
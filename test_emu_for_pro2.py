@@ -9,6 +9,7 @@ Press Ctrl+C to stop.
 
 import sys
 import os
+import itertools
 import threading
 import time
 import signal
@@ -35,9 +36,13 @@ def find_serial_port():
 
 SERIAL_PORT = find_serial_port()
 
+# Command byte (frame offset 6) of target-mode frames worth printing:
+# TgInitAsTarget(8C) and its response (8D), TgGetData(86) and its response (87)
+TARGET_CMDS = frozenset((0x8C, 0x8D, 0x86, 0x87))
+
 def make_test_data(size=2048):
     """Generate recognizable test pattern: 0x00..0xFF repeating."""
-    return bytes([i & 0xFF for i in range(size)])
+    return (bytes(range(256)) * (size // 256 + 1))[:size]
 
 def main():
     signal.alarm(0)  # clear any inherited alarm
@@ -76,19 +81,22 @@ def main():
         while emu_thread.is_alive():
             current_count = len(logs)
             if current_count > last_log_count:
-                for i in range(last_log_count, min(current_count, last_log_count + 50)):
-                    try:
-                        entry = logs[i]
-                        d = entry.get("direction", "?")
-                        data = entry.get("data", "")
-                        if d == "ERR":
-                            print(f"  ❌ {data}")
-                        elif "8c" in str(data).lower() or "8d" in str(data).lower() or "86" in str(data).lower() or "87" in str(data).lower():
-                            # TgInitAsTarget(8C), TgResponseToInitiator(8D), TgGetData(86), TgSetData(8E)
-                            short = data[:60] + "..." if len(str(data)) > 60 else data
-                            print(f"  [{d}] {short}")
-                    except IndexError:
-                        pass
+                # Snapshot the new entries in one pass; deque indexing is
+                # O(n) per lookup. list(islice(...)) runs entirely in C, so the
+                # emulator thread cannot mutate the deque mid-copy.
+                batch = list(itertools.islice(
+                    logs, last_log_count, min(current_count, last_log_count + 50)))
+                for entry in batch:
+                    d = entry.direction
+                    raw = entry.raw
+                    if d == "ERR":
+                        print(f"  ❌ {entry.data}")
+                    elif raw is not None and len(raw) > 6 and raw[6] in TARGET_CMDS:
+                        # Filter on the frame's command byte; only printed
+                        # entries are formatted as hex
+                        data = entry.data
+                        short = data[:60] + "..." if len(data) > 60 else data
+                        print(f"  [{d}] {short}")
                 last_log_count = current_count
             time.sleep(0.2)
             sys.stdout.flush()
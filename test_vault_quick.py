@@ -3,7 +3,7 @@
 import sys
 import time
 sys.path.insert(0, '.')
-from pn532 import PN532
+from pn532 import PN532, SETTLE
 
 def extract_data(result):
     """Extract raw bytes from read_vault_tag result dict."""
@@ -12,7 +12,7 @@ def extract_data(result):
     if isinstance(result, dict):
         hex_str = result.get('data_hex', '')
         if hex_str:
-            return bytes.fromhex(hex_str.replace(' ', ''))
+            return bytes.fromhex(hex_str)
         return b''
     return result
 
@@ -35,7 +35,7 @@ def test_vault():
         return False
     print(f"  Write OK, {result['bytes_written']} bytes written")
     
-    time.sleep(0.3)
+    time.sleep(SETTLE)
     
     raw = extract_data(pn.read_vault_tag(0, len(test_data)))
     if raw is None:
@@ -56,7 +56,7 @@ def test_vault():
         return False
     print(f"  Write OK, {result2['bytes_written']} bytes written")
     
-    time.sleep(0.3)
+    time.sleep(SETTLE)
     
     raw2 = extract_data(pn.read_vault_tag(300, len(test_data2)))
     if raw2 is None:
@@ -89,7 +89,7 @@ def test_vault():
         return False
     print(f"  Write OK, {result3['bytes_written']} bytes written in {result3.get('chunks', '?')} chunks")
     
-    time.sleep(0.3)
+    time.sleep(SETTLE)
     
     raw3 = extract_data(pn.read_vault_tag(0, 128))
     if raw3 is None: